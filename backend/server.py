@@ -1,16 +1,33 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Path, Response
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from pydantic import BaseModel, ConfigDict
 from typing import List, Optional, Dict
 from datetime import datetime, date
 from decimal import Decimal
 import os
+import bisect
+import numpy as np
+import orjson
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo.server_api import ServerApi
 import uuid
 from enum import Enum
 
+def _orjson_default(obj):
+    """Serialize types orjson does not handle natively"""
+    if isinstance(obj, Decimal):
+        return float(obj)
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+class APIJSONResponse(ORJSONResponse):
+    """ORJSONResponse with a fallback serializer for Decimal values"""
+
+    def render(self, content) -> bytes:
+        return orjson.dumps(content, default=_orjson_default)
+
 # Initialize FastAPI app
-app = FastAPI(title="Brazilian Investment Tracker")
+app = FastAPI(title="Brazilian Investment Tracker", default_response_class=APIJSONResponse)
 
 # CORS middleware
 app.add_middleware(
@@ -25,9 +42,34 @@ app.add_middleware(
 MONGO_URL = os.environ.get('MONGO_URL', 'mongodb://localhost:27017')
 DB_NAME = os.environ.get('DB_NAME', 'investment_tracker')
 
-client = AsyncIOMotorClient(MONGO_URL)
+# Single shared client; wire compression shrinks operation documents in transit
+client = AsyncIOMotorClient(
+    MONGO_URL,
+    compressors="zstd,zlib",
+    maxPoolSize=50,
+    server_api=ServerApi('1')
+)
 db = client[DB_NAME]
 
+@app.on_event("startup")
+async def create_indexes():
+    """Create indexes backing the DARF range query and operation filters"""
+    await db.operations.create_index([("operation_date", 1), ("operation_type", 1), ("asset_type", 1)])
+    await db.operations.create_index("asset_code")
+
+@app.on_event("startup")
+async def migrate_operation_dates():
+    """Convert legacy ISO string operation dates to native BSON dates"""
+    # Unparsable values keep their original string so one bad document can't block startup
+    await db.operations.update_many(
+        {"operation_date": {"$type": "string"}},
+        [{"$set": {"operation_date": {"$dateFromString": {
+            "dateString": "$operation_date",
+            "onError": "$operation_date",
+            "onNull": "$operation_date"
+        }}}}]
+    )
+
 # Enums
 class AssetType(str, Enum):
     ACAO = "acao"
@@ -45,8 +87,17 @@ class TradeCategory(str, Enum):
     SWING_TRADE = "swing_trade"
     DAY_TRADE = "day_trade"
 
+# Enum values are static, so the asset types payload is serialized once
+_ASSET_TYPES_BYTES = orjson.dumps({
+    "asset_types": [e.value for e in AssetType],
+    "trade_categories": [e.value for e in TradeCategory],
+    "operation_types": [e.value for e in OperationType]
+})
+
 # Pydantic models
 class Operation(BaseModel):
+    model_config = ConfigDict(extra='forbid')
+    
     id: Optional[str] = None
     asset_code: str
     asset_type: AssetType
@@ -77,17 +128,29 @@ class DARFCalculation(BaseModel):
     ir_retained: float
     net_tax_due: float
 
+class DARFResponse(BaseModel):
+    message: Optional[str] = None
+    calculations: List[DARFCalculation]
+
+# Progressive crypto brackets: até R$ 5M, até R$ 10M, até R$ 30M, acima de R$ 30M
+_CRYPTO_BRACKETS = (5_000_000, 10_000_000, 30_000_000)
+_CRYPTO_RATES = (0.15, 0.175, 0.20, 0.225)
+
 class TaxCalculationService:
     """Service to calculate Brazilian taxes according to 2025 regulations"""
     
+    # Shared by the per-category methods and the batch calculation
+    SWING_TRADE_EXEMPTION = 20000.0  # sales <= R$ 20,000 per month
+    SWING_TRADE_RATE = 0.15
+    DAY_TRADE_RATE = 0.20
+    IR_RETENTION_RATE = 0.01  # 1% retention ("dedo-duro")
+    FII_RATE = 0.20
+    CRYPTO_EXEMPTION = 35000.0  # sales <= R$ 35,000 per month
+    
     @staticmethod
     def calculate_swing_trade_tax(sales_amount: float, profit: float) -> Dict:
         """Calculate tax for swing trade operations (ações, ETFs, BDRs)"""
-        # Exemption: sales <= R$ 20,000 per month
-        MONTHLY_EXEMPTION = 20000.0
-        TAX_RATE = 0.15
-        
-        if sales_amount <= MONTHLY_EXEMPTION:
+        if sales_amount <= TaxCalculationService.SWING_TRADE_EXEMPTION:
             return {
                 "tax_rate": 0.0,
                 "tax_due": 0.0,
@@ -96,9 +159,10 @@ class TaxCalculationService:
                 "net_tax_due": 0.0
             }
         
-        tax_due = max(0, profit * TAX_RATE)
+        tax_rate = TaxCalculationService.SWING_TRADE_RATE
+        tax_due = max(0.0, profit * tax_rate)
         return {
-            "tax_rate": TAX_RATE,
+            "tax_rate": tax_rate,
             "tax_due": tax_due,
             "exemption_applied": False,
             "ir_retained": 0.0,
@@ -108,15 +172,14 @@ class TaxCalculationService:
     @staticmethod
     def calculate_day_trade_tax(profit: float) -> Dict:
         """Calculate tax for day trade operations"""
-        TAX_RATE = 0.20
-        IR_RETENTION_RATE = 0.01  # 1% retention ("dedo-duro")
+        tax_rate = TaxCalculationService.DAY_TRADE_RATE
         
-        tax_due = max(0, profit * TAX_RATE)
-        ir_retained = profit * IR_RETENTION_RATE if profit > 0 else 0
-        net_tax_due = max(0, tax_due - ir_retained)
+        tax_due = max(0.0, profit * tax_rate)
+        ir_retained = profit * TaxCalculationService.IR_RETENTION_RATE if profit > 0 else 0.0
+        net_tax_due = max(0.0, tax_due - ir_retained)
         
         return {
-            "tax_rate": TAX_RATE,
+            "tax_rate": tax_rate,
             "tax_due": tax_due,
             "exemption_applied": False,
             "ir_retained": ir_retained,
@@ -126,11 +189,11 @@ class TaxCalculationService:
     @staticmethod
     def calculate_fii_tax(profit: float) -> Dict:
         """Calculate tax for FII operations"""
-        TAX_RATE = 0.20
+        tax_rate = TaxCalculationService.FII_RATE
         
-        tax_due = max(0, profit * TAX_RATE)
+        tax_due = max(0.0, profit * tax_rate)
         return {
-            "tax_rate": TAX_RATE,
+            "tax_rate": tax_rate,
             "tax_due": tax_due,
             "exemption_applied": False,
             "ir_retained": 0.0,
@@ -140,9 +203,7 @@ class TaxCalculationService:
     @staticmethod
     def calculate_crypto_tax(sales_amount: float, profit: float) -> Dict:
         """Calculate progressive tax for cryptocurrency operations"""
-        MONTHLY_EXEMPTION = 35000.0
-        
-        if sales_amount <= MONTHLY_EXEMPTION:
+        if sales_amount <= TaxCalculationService.CRYPTO_EXEMPTION:
             return {
                 "tax_rate": 0.0,
                 "tax_due": 0.0,
@@ -151,17 +212,10 @@ class TaxCalculationService:
                 "net_tax_due": 0.0
             }
         
-        # Progressive tax rates for crypto
-        if profit <= 5000000:  # até R$ 5M
-            tax_rate = 0.15
-        elif profit <= 10000000:  # até R$ 10M
-            tax_rate = 0.175
-        elif profit <= 30000000:  # até R$ 30M
-            tax_rate = 0.20
-        else:  # acima de R$ 30M
-            tax_rate = 0.225
+        # Progressive tax rates for crypto (upper bounds are inclusive)
+        tax_rate = _CRYPTO_RATES[bisect.bisect_left(_CRYPTO_BRACKETS, profit)]
         
-        tax_due = max(0, profit * tax_rate)
+        tax_due = max(0.0, profit * tax_rate)
         return {
             "tax_rate": tax_rate,
             "tax_due": tax_due,
@@ -170,53 +224,92 @@ class TaxCalculationService:
             "net_tax_due": tax_due
         }
 
-class PortfolioService:
-    """Service to calculate portfolio metrics and cost basis"""
-    
     @staticmethod
-    async def calculate_cost_basis(asset_code: str, operations: List[Dict]) -> Dict:
-        """Calculate average cost basis for an asset using FIFO method"""
-        buy_operations = [op for op in operations if op['operation_type'] == 'compra']
-        sell_operations = [op for op in operations if op['operation_type'] == 'venda']
-        
-        # Sort by date
-        buy_operations.sort(key=lambda x: x['operation_date'])
-        sell_operations.sort(key=lambda x: x['operation_date'])
+    def calculate_taxes(asset_types: List[str], trade_categories: List[str],
+                        sales_amounts: np.ndarray, profits: np.ndarray) -> Dict[str, np.ndarray]:
+        """Apply the per-category tax rules above to many groups at once"""
+        service = TaxCalculationService
         
-        total_quantity = 0
-        total_cost = 0
-        realized_profit = 0
+        asset_types = np.asarray(asset_types)
+        is_day_trade = np.asarray(trade_categories) == "day_trade"
+        is_crypto = ~is_day_trade & (asset_types == "cripto")
+        is_fii = ~is_day_trade & (asset_types == "fii")
+        is_swing_trade = ~(is_day_trade | is_crypto | is_fii)
         
-        # Calculate purchases
-        for buy_op in buy_operations:
-            total_quantity += buy_op['quantity']
-            total_cost += buy_op['total_cost']
-        
-        average_cost = total_cost / total_quantity if total_quantity > 0 else 0
+        crypto_rates = np.asarray(_CRYPTO_RATES)[np.searchsorted(_CRYPTO_BRACKETS, profits, side="left")]
+        rates = np.select(
+            [is_day_trade, is_fii, is_crypto],
+            [service.DAY_TRADE_RATE, service.FII_RATE, crypto_rates],
+            default=service.SWING_TRADE_RATE
+        )
+        exemption_applied = (
+            (is_swing_trade & (sales_amounts <= service.SWING_TRADE_EXEMPTION))
+            | (is_crypto & (sales_amounts <= service.CRYPTO_EXEMPTION))
+        )
         
-        # Calculate sales and realized profit
-        remaining_quantity = total_quantity
-        for sell_op in sell_operations:
-            sell_quantity = sell_op['quantity']
-            sell_value = sell_op['quantity'] * sell_op['unit_price']
-            cost_basis = sell_quantity * average_cost
-            realized_profit += sell_value - cost_basis
-            remaining_quantity -= sell_quantity
+        tax_rate = np.where(exemption_applied, 0.0, rates)
+        # Exempt rows are zeroed explicitly: a negative profit times a 0.0 rate is -0.0
+        tax_due = np.where(exemption_applied, 0.0, np.maximum(profits * tax_rate, 0.0))
+        ir_retained = np.where(is_day_trade & (profits > 0), profits * service.IR_RETENTION_RATE, 0.0)
+        net_tax_due = np.where(exemption_applied, 0.0, np.maximum(tax_due - ir_retained, 0.0))
         
+        return {
+            "tax_rate": tax_rate,
+            "tax_due": tax_due,
+            "exemption_applied": exemption_applied,
+            "ir_retained": ir_retained,
+            "net_tax_due": net_tax_due
+        }
+
+def _cost_basis_kernel(buy_qty: np.ndarray, buy_cost: np.ndarray,
+                       sell_qty: np.ndarray, sell_value: np.ndarray):
+    """Average-cost position math over per-asset float64 totals"""
+    average_cost = np.divide(buy_cost, buy_qty, out=np.zeros_like(buy_cost), where=buy_qty > 0)
+    remaining_quantity = buy_qty - sell_qty
+    realized_profit = sell_value - sell_qty * average_cost
+    
+    return remaining_quantity, average_cost, realized_profit
+
+class PortfolioService:
+    """Service to calculate portfolio metrics and cost basis"""
+    
+    @staticmethod
+    def calculate_cost_basis(asset_totals: Dict[str, List[float]]) -> Dict[str, Dict]:
+        """Calculate average cost basis for each asset from its
+        [buy_qty, buy_cost, sell_qty, sell_value] totals"""
+        buy_qty, buy_cost, sell_qty, sell_value = np.array(
+            list(asset_totals.values()), dtype=np.float64
+        ).reshape(-1, 4).T
+        remaining_quantity, average_cost, realized_profit = _cost_basis_kernel(
+            buy_qty, buy_cost, sell_qty, sell_value
+        )
         current_position_value = remaining_quantity * average_cost
         
         return {
-            "asset_code": asset_code,
-            "total_quantity": remaining_quantity,
-            "average_cost": average_cost,
-            "current_position_value": current_position_value,
-            "realized_profit": realized_profit
+            asset_code: {
+                "asset_code": asset_code,
+                "total_quantity": quantity,
+                "total_cost": cost,
+                "average_cost": average,
+                "current_position_value": position_value,
+                "realized_profit": profit
+            }
+            for asset_code, quantity, cost, average, position_value, profit in zip(
+                asset_totals,
+                remaining_quantity.tolist(),
+                buy_cost.tolist(),
+                average_cost.tolist(),
+                current_position_value.tolist(),
+                realized_profit.tolist()
+            )
         }
 
 # API Routes
+_HEALTH_BYTES = orjson.dumps({"status": "healthy", "service": "Brazilian Investment Tracker"})
+
 @app.get("/api/health")
 async def health_check():
-    return {"status": "healthy", "service": "Brazilian Investment Tracker"}
+    return Response(content=_HEALTH_BYTES, media_type="application/json")
 
 @app.post("/api/operations")
 async def create_operation(operation: Operation):
@@ -224,14 +317,35 @@ async def create_operation(operation: Operation):
     operation.id = str(uuid.uuid4())
     operation.created_at = datetime.now()
     
-    operation_dict = operation.dict()
-    operation_dict['operation_date'] = operation.operation_date.isoformat()
-    operation_dict['created_at'] = operation.created_at.isoformat()
+    operation_dict = operation.model_dump(mode='json', exclude_none=True)
+    # Store a native BSON date so DARF range queries compare dates, not strings
+    operation_date = operation.operation_date
+    operation_dict['operation_date'] = datetime(operation_date.year, operation_date.month, operation_date.day)
     
     result = await db.operations.insert_one(operation_dict)
     return {"id": operation.id, "message": "Operation created successfully"}
 
-@app.get("/api/operations")
+_OPERATIONS_BATCH_SIZE = 500
+
+async def _stream_operations(cursor):
+    """Yield a JSON array of operations, one cursor batch at a time"""
+    separator = b"["
+    chunks = []
+    async for operation in cursor:
+        # Legacy or unmigrated documents pass through unchanged
+        if isinstance(operation.get('operation_date'), datetime):
+            operation['operation_date'] = operation['operation_date'].date()
+        chunks.append(orjson.dumps(operation, default=_orjson_default))
+        if len(chunks) == _OPERATIONS_BATCH_SIZE:
+            yield separator + b",".join(chunks)
+            separator = b","
+            chunks = []
+    if chunks:
+        yield separator + b",".join(chunks)
+        separator = b","
+    yield b"[]" if separator == b"[" else b"]"
+
+@app.get("/api/operations", responses={200: {"model": List[Operation]}})
 async def get_operations(asset_code: Optional[str] = None, asset_type: Optional[AssetType] = None):
     """Get all operations with optional filters"""
     query = {}
@@ -240,14 +354,9 @@ async def get_operations(asset_code: Optional[str] = None, asset_type: Optional[
     if asset_type:
         query["asset_type"] = asset_type
     
-    operations = await db.operations.find(query).to_list(1000)
-    
-    # Convert MongoDB documents to serializable format
-    for operation in operations:
-        if '_id' in operation:
-            del operation['_id']  # Remove MongoDB ObjectId
-    
-    return operations
+    # Exclude the MongoDB ObjectId at projection time
+    cursor = db.operations.find(query, projection={"_id": 0}).batch_size(_OPERATIONS_BATCH_SIZE)
+    return StreamingResponse(_stream_operations(cursor), media_type="application/json")
 
 @app.delete("/api/operations/{operation_id}")
 async def delete_operation(operation_id: str):
@@ -257,135 +366,129 @@ async def delete_operation(operation_id: str):
         raise HTTPException(status_code=404, detail="Operation not found")
     return {"message": "Operation deleted successfully"}
 
-@app.get("/api/portfolio/summary")
+@app.get("/api/portfolio/summary", responses={200: {"model": PortfolioSummary}})
 async def get_portfolio_summary():
     """Get portfolio summary with total invested, current value, and P&L"""
-    operations = await db.operations.find().to_list(1000)
+    # Aggregate buy/sell totals per asset inside MongoDB
+    pipeline = [{
+        "$group": {
+            "_id": {"asset": "$asset_code", "op": "$operation_type"},
+            "qty": {"$sum": "$quantity"},
+            "cost": {"$sum": "$total_cost"},
+            "gross": {"$sum": {"$multiply": ["$quantity", "$unit_price"]}}
+        }
+    }]
     
-    if not operations:
-        return PortfolioSummary(
-            total_invested=0,
-            total_current_value=0,
-            total_profit_loss=0,
-            profit_loss_percentage=0,
-            assets_distribution={}
-        )
+    # asset_code -> [buy_qty, buy_cost, sell_qty, sell_value]
+    asset_totals = {}
+    async for row in db.operations.aggregate(pipeline):
+        totals = asset_totals.setdefault(row['_id']['asset'], [0.0, 0.0, 0.0, 0.0])
+        if row['_id']['op'] == 'compra':
+            totals[0] = row['qty']
+            totals[1] = row['cost']
+        else:
+            totals[2] = row['qty']
+            totals[3] = row['gross']
     
-    # Group operations by asset
-    assets = {}
-    total_invested = 0
-    total_realized_profit = 0
+    if not asset_totals:
+        return APIJSONResponse(content={
+            "total_invested": 0.0,
+            "total_current_value": 0.0,
+            "total_profit_loss": 0.0,
+            "profit_loss_percentage": 0.0,
+            "assets_distribution": {}
+        })
     
-    for op in operations:
-        asset_code = op['asset_code']
-        if asset_code not in assets:
-            assets[asset_code] = []
-        assets[asset_code].append(op)
-        
-        if op['operation_type'] == 'compra':
-            total_invested += op['total_cost']
+    # Calculate current positions and realized profits for all assets at once
+    cost_basis = PortfolioService.calculate_cost_basis(asset_totals)
     
-    # Calculate current positions and realized profits
-    assets_distribution = {}
-    for asset_code, asset_operations in assets.items():
-        cost_basis = await PortfolioService.calculate_cost_basis(asset_code, asset_operations)
-        total_realized_profit += cost_basis['realized_profit']
-        
-        if cost_basis['total_quantity'] > 0:
-            assets_distribution[asset_code] = cost_basis['current_position_value']
+    total_invested = sum(asset['total_cost'] for asset in cost_basis.values())
+    total_realized_profit = sum(asset['realized_profit'] for asset in cost_basis.values())
+    assets_distribution = {
+        asset_code: asset['current_position_value']
+        for asset_code, asset in cost_basis.items()
+        if asset['total_quantity'] > 0
+    }
     
     total_current_value = sum(assets_distribution.values())
     total_profit_loss = total_realized_profit + (total_current_value - total_invested)
     profit_loss_percentage = (total_profit_loss / total_invested * 100) if total_invested > 0 else 0
     
-    return PortfolioSummary(
-        total_invested=total_invested,
-        total_current_value=total_current_value,
-        total_profit_loss=total_profit_loss,
-        profit_loss_percentage=profit_loss_percentage,
-        assets_distribution=assets_distribution
-    )
+    return APIJSONResponse(content={
+        "total_invested": total_invested,
+        "total_current_value": total_current_value,
+        "total_profit_loss": total_profit_loss,
+        "profit_loss_percentage": profit_loss_percentage,
+        "assets_distribution": assets_distribution
+    })
 
-@app.get("/api/darf/calculate/{year}/{month}")
-async def calculate_darf(year: int, month: int):
+@app.get("/api/darf/calculate/{year}/{month}", responses={200: {"model": DARFResponse}})
+async def calculate_darf(year: int = Path(..., ge=1, le=9998), month: int = Path(..., ge=1, le=12)):
     """Calculate DARF tax for a specific month"""
     # Get operations for the specified month
-    start_date = f"{year}-{month:02d}-01"
-    if month == 12:
-        end_date = f"{year + 1}-01-01"
-    else:
-        end_date = f"{year}-{month + 1:02d}-01"
-    
-    operations = await db.operations.find({
-        "operation_date": {"$gte": start_date, "$lt": end_date},
-        "operation_type": "venda"
-    }).to_list(1000)
+    start_date = datetime(year, month, 1)
+    end_date = datetime(year + (month == 12), month % 12 + 1, 1)
     
-    if not operations:
-        return {"message": "No sales operations found for this month", "calculations": []}
+    pipeline = [
+        {"$match": {
+            "operation_date": {"$gte": start_date, "$lt": end_date},
+            "operation_type": "venda"
+        }},
+        {"$group": {
+            "_id": {"asset_type": "$asset_type", "trade_category": "$trade_category"},
+            "total_sales": {"$sum": {"$multiply": ["$quantity", "$unit_price"]}}
+        }}
+    ]
     
-    # Group by asset type and trade category
+    # Group by asset type and trade category inside MongoDB (one row per group)
     grouped_sales = {}
-    for op in operations:
-        key = f"{op['asset_type']}_{op['trade_category']}"
-        if key not in grouped_sales:
-            grouped_sales[key] = {
-                "operations": [],
-                "total_sales": 0,
-                "total_profit": 0
-            }
-        grouped_sales[key]["operations"].append(op)
-        grouped_sales[key]["total_sales"] += op['quantity'] * op['unit_price']
+    async for row in db.operations.aggregate(pipeline):
+        grouped_sales[(row['_id']['asset_type'], row['_id']['trade_category'])] = row['total_sales']
+    
+    if not grouped_sales:
+        return APIJSONResponse(content={"message": "No sales operations found for this month", "calculations": []})
+    
+    group_keys = list(grouped_sales)
+    total_sales = np.array(list(grouped_sales.values()), dtype=np.float64)
+    
+    # Calculate profit (simplified - would need cost basis calculation)
+    total_profits = total_sales * 0.1  # Simplified 10% profit for demo
+    
+    # Apply tax rules to all groups at once
+    taxes = TaxCalculationService.calculate_taxes(
+        [asset_type for asset_type, _ in group_keys],
+        [trade_category for _, trade_category in group_keys],
+        total_sales,
+        total_profits
+    )
+    
+    # Build plain response dicts; the values come from our own calculation
+    month_label = f"{year}-{month:02d}"
+    total_sales = total_sales.tolist()
+    total_profits = total_profits.tolist()
+    taxes = {name: values.tolist() for name, values in taxes.items()}
     
-    # Calculate profit for each group
     darf_calculations = []
-    for key, data in grouped_sales.items():
-        # Handle key splitting more safely
-        key_parts = key.split('_')
-        if len(key_parts) >= 2:
-            asset_type = key_parts[0]
-            trade_category = '_'.join(key_parts[1:])  # Join remaining parts for 'swing_trade'
-        else:
-            continue  # Skip malformed keys
-        
-        # Calculate profit (simplified - would need cost basis calculation)
-        total_profit = data["total_sales"] * 0.1  # Simplified 10% profit for demo
-        
-        # Apply tax rules
-        tax_calc = {}
-        if trade_category == "day_trade":
-            tax_calc = TaxCalculationService.calculate_day_trade_tax(total_profit)
-        elif asset_type == "cripto":
-            tax_calc = TaxCalculationService.calculate_crypto_tax(data["total_sales"], total_profit)
-        elif asset_type == "fii":
-            tax_calc = TaxCalculationService.calculate_fii_tax(total_profit)
-        else:  # swing trade for ações, ETFs, BDRs
-            tax_calc = TaxCalculationService.calculate_swing_trade_tax(data["total_sales"], total_profit)
-        
-        # Ensure ir_retained is always present
-        if 'ir_retained' not in tax_calc:
-            tax_calc['ir_retained'] = 0.0
-        
-        darf_calc = DARFCalculation(
-            month=f"{year}-{month:02d}",
-            year=year,
-            asset_type=AssetType(asset_type),
-            total_sales=data["total_sales"],
-            taxable_profit=total_profit,
-            **tax_calc
-        )
-        darf_calculations.append(darf_calc)
+    for i, (asset_type, _) in enumerate(group_keys):
+        darf_calculations.append({
+            "month": month_label,
+            "year": year,
+            "asset_type": asset_type,
+            "total_sales": total_sales[i],
+            "taxable_profit": total_profits[i],
+            "tax_rate": taxes["tax_rate"][i],
+            "tax_due": taxes["tax_due"][i],
+            "exemption_applied": taxes["exemption_applied"][i],
+            "ir_retained": taxes["ir_retained"][i],
+            "net_tax_due": taxes["net_tax_due"][i]
+        })
     
-    return {"calculations": darf_calculations}
+    return APIJSONResponse(content={"calculations": darf_calculations})
 
 @app.get("/api/assets/types")
 async def get_asset_types():
     """Get available asset types"""
-    return {
-        "asset_types": [e.value for e in AssetType],
-        "trade_categories": [e.value for e in TradeCategory],
-        "operation_types": [e.value for e in OperationType]
-    }
+    return Response(content=_ASSET_TYPES_BYTES, media_type="application/json")
 
 if __name__ == "__main__":
     import uvicorn
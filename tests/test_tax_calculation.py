@@ -0,0 +1,96 @@
+import math
+import os
+import random
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+from server import TaxCalculationService  # noqa: E402
+
+ASSET_TYPES = ["acao", "etf", "fii", "bdr", "opcao", "cripto"]
+TRADE_CATEGORIES = ["swing_trade", "day_trade"]
+
+
+def _scalar_tax(asset_type, trade_category, sales_amount, profit):
+    """Dispatch to the per-category rule the same way calculate_darf used to"""
+    if trade_category == "day_trade":
+        return TaxCalculationService.calculate_day_trade_tax(profit)
+    if asset_type == "cripto":
+        return TaxCalculationService.calculate_crypto_tax(sales_amount, profit)
+    if asset_type == "fii":
+        return TaxCalculationService.calculate_fii_tax(profit)
+    return TaxCalculationService.calculate_swing_trade_tax(sales_amount, profit)
+
+
+def _batch_tax(groups):
+    """Run calculate_taxes over (asset_type, trade_category, sales, profit) groups as native values"""
+    asset_types, trade_categories, sales_amounts, profits = zip(*groups)
+    taxes = TaxCalculationService.calculate_taxes(
+        list(asset_types), list(trade_categories),
+        np.array(sales_amounts, dtype=np.float64), np.array(profits, dtype=np.float64)
+    )
+    return {name: values.tolist() for name, values in taxes.items()}
+
+
+def _assert_same(actual, expected, context):
+    assert type(actual) is type(expected), context
+    assert actual == expected, context
+    if isinstance(expected, float):
+        assert math.copysign(1, actual) == math.copysign(1, expected), context
+
+
+def _random_groups(count, seed):
+    rng = random.Random(seed)
+    exemptions = [TaxCalculationService.SWING_TRADE_EXEMPTION, TaxCalculationService.CRYPTO_EXEMPTION]
+    groups = []
+    for _ in range(count):
+        sales_amount = rng.choice([rng.uniform(0, 1e8), rng.uniform(0, 50000)] + exemptions)
+        profit = rng.choice([
+            sales_amount * 0.1, -sales_amount * 0.1, 0.0,
+            5_000_000.0, 10_000_000.0, 30_000_000.0, rng.uniform(-1e8, 1e8)
+        ])
+        groups.append((rng.choice(ASSET_TYPES), rng.choice(TRADE_CATEGORIES), sales_amount, profit))
+    return groups
+
+
+@pytest.mark.parametrize("seed", [1, 2, 3])
+def test_calculate_taxes_matches_per_category_rules(seed):
+    groups = _random_groups(5000, seed)
+    taxes = _batch_tax(groups)
+
+    for i, group in enumerate(groups):
+        for name, value in _scalar_tax(*group).items():
+            _assert_same(taxes[name][i], value, (group, name))
+
+
+@pytest.mark.parametrize("asset_type, trade_category", [
+    ("acao", "swing_trade"),
+    ("etf", "swing_trade"),
+    ("cripto", "swing_trade"),
+])
+def test_exempt_group_with_negative_profit_owes_positive_zero(asset_type, trade_category):
+    group = (asset_type, trade_category, 100.0, -5.0)
+    taxes = _batch_tax([group])
+
+    assert taxes["exemption_applied"] == [True]
+    for name in ("tax_rate", "tax_due", "ir_retained", "net_tax_due"):
+        _assert_same(taxes[name][0], 0.0, (group, name))
+        _assert_same(_scalar_tax(*group)[name], 0.0, (group, name))
+
+
+@pytest.mark.parametrize("profit, tax_rate", [
+    (5_000_000.0, 0.15),
+    (5_000_000.01, 0.175),
+    (10_000_000.0, 0.175),
+    (10_000_000.01, 0.20),
+    (30_000_000.0, 0.20),
+    (30_000_000.01, 0.225),
+])
+def test_crypto_bracket_bounds(profit, tax_rate):
+    group = ("cripto", "swing_trade", 1e9, profit)
+
+    _assert_same(_batch_tax([group])["tax_rate"][0], tax_rate, group)
+    _assert_same(_scalar_tax(*group)["tax_rate"], tax_rate, group)